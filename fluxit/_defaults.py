@@ -5,7 +5,7 @@ defaults.py: Basic configuration defaults
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Defaults:
     k8s_app_dir: str = "kubernetes/apps"
     template_dir: str = ".templates/fluxit"
@@ -0,0 +1,134 @@
+"""
+_runner.py: Orchestrates a single fluxit run once the CLI options have been collected.
+"""
+
+import logging
+import os
+import stat
+import sys
+from pathlib import Path
+
+from . import fluxit
+from .output import confirm_and_save
+
+
+def is_dir(path: Path) -> bool:
+    """Checks with a single stat call that `path` exists and is a directory."""
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    # Anything os.stat trips over (missing, not a directory, symlink loops) is not usable
+    except OSError:
+        return False
+
+
+def process_file(
+    output_file_path: Path,
+    raw_content: bytes,
+    confirm: str,
+    logger: logging.Logger,
+    color: bool = True,
+    created_dirs: set[Path] | None = None,
+) -> None:
+    """Validates, formats and saves a single rendered template.
+
+    Args:
+        output_file_path: The path where the file should be saved.
+        raw_content: The rendered template content, UTF-8 encoded.
+        confirm: Confirmation mode ('always', 'never', 'if_exists').
+        logger: The logger instance.
+        color: Whether to use color for diff output.
+        created_dirs: Directories already created during the current run.
+    """
+    confirm_and_save(
+        output_file_path,
+        raw_content,
+        # Formatting is deferred until confirm_and_save knows it needs the formatted content
+        lambda: fluxit.format_yaml(raw_content.decode("utf-8")),
+        confirm,
+        logger,
+        color=color,
+        created_dirs=created_dirs,
+    )
+
+
+def run(
+    *,
+    k8s_app_dir: Path,
+    template_dir: Path,
+    template: str,
+    ns: str,
+    app_name: str,
+    log_level: str,
+    ingress: str,
+    service_port: int,
+    replicas: int,
+    ingress_host: str,
+    image_repo: str,
+    image_tag: str,
+    confirm: str,
+    deployment_strategy: str,
+    color: bool,
+    include_cm: bool,
+    include_secret: bool,
+) -> None:
+    """Renders the selected template and saves the resulting manifests.
+
+    Takes the same arguments as the `fluxit` CLI command, see `fluxit --help`.
+    """
+    logger = fluxit.init_logging(log_level)
+    logger.info("Starting 🧪 fluxit")
+
+    template_full_path = template_dir / template
+    logger.info("Using template path: %s", template_full_path)
+    # k8s_app_dir and template_dir are already checked by their option callbacks
+    if not is_dir(template_full_path):
+        logger.error("Template path does not exist or is not a directory: %s", template_full_path)
+        sys.exit(1)
+
+    template_context = {
+        "app_name": app_name,
+        "namespace": ns,
+        "ingress_type": ingress,
+        "ingress_host": ingress_host,
+        "image_repo": image_repo,
+        "image_tag": image_tag,
+        "deployment_strategy": deployment_strategy,
+        "replicas": replicas,
+        "include_cm": include_cm,
+        "include_secret": include_secret,
+        "service_port": service_port,
+    }
+
+    # Everything is rendered before the first file is saved, so a template that fails
+    # to render never leaves a partial scaffold behind
+    try:
+        rendered_templates = fluxit.render_templates(
+            str(template_full_path),
+            template_context,
+        )
+    except Exception as e:
+        logger.error("Failed during template rendering: %s", e)
+        sys.exit(1)
+    # Apparenty this is now an accepted Python practice, since these are Path objects,
+    # it's OK to just join them like this.
+    output_base_dir = k8s_app_dir / ns / app_name
+    logger.info("Target directory: %s", output_base_dir)
+    # Output directories created by this run, so files sharing a parent only create it once
+    created_dirs: set[Path] = set()
+
+    for relative_path, raw_content in rendered_templates:
+        # A file that can't be processed (e.g. an existing file that isn't UTF-8)
+        # is reported without giving up on the remaining files
+        try:
+            process_file(
+                output_base_dir / relative_path,
+                raw_content,
+                confirm,
+                logger,
+                color,
+                created_dirs,
+            )
+        except Exception as e:
+            logger.error("Error processing file %s: %s", relative_path, e)
+
+    logger.info("Fluxit finished ✨.")
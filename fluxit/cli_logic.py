@@ -1,18 +1,38 @@
-import functools
 import logging
+import os
 import re
+import stat
 from collections.abc import Sequence
 from logging import Logger
-from typing import Any, Callable, Literal, ParamSpec, TypeVar, cast, final, override
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Literal, ParamSpec, TypeVar, cast, final, override
 
 import click
-from InquirerPy import inquirer
-from InquirerPy.validator import ValidationError, Validator
 
-from .fluxit import get_ns
+# InquirerPy is only imported (via .prompts) once a prompt actually fires
+if TYPE_CHECKING:
+    from InquirerPy.validator import Validator
 
 logger: Logger = logging.getLogger(__name__)
 
+_APP_NAME_RE = re.compile(r"[a-z0-9_-]+")
+
+
+@final
+class LazyValidator:
+    """Marks a zero-argument factory returning a validator for :class:`PromptMeta`.
+
+    The factory is only called when prompting, which keeps InquirerPy off the import path.
+    Plain validators and validation functions are passed to InquirerPy unchanged.
+
+    :param factory: Returns the validation object or function to use.
+    """
+
+    __slots__ = ("factory",)
+
+    def __init__(self, factory: "Callable[[], Validator | Callable[[str], bool]]"):
+        self.factory = factory
+
 
 @final
 class PromptMeta:
@@ -26,12 +46,23 @@ class PromptMeta:
     :param choices: A callable that returns a sequence of choices. Note: if :class:`click.Choice`
                     is used as the type, choices will be derived from it instead.
     :param validate: Validator, optional
-        A validation function or object to validate user input.
+        A validation function or object to validate user input, or a :class:`LazyValidator`
+        to only create one when prompting.
     :param prompt_with_default: Whether to show the default value in the prompt. Defaults to False.
     :param prompt_when_missing: Whether to prompt only when the option is missing. Defaults to True.
     **kwargs: Additional keyword arguments forwarded to Click.
     """
 
+    __slots__ = (
+        "prompt_type",
+        "message",
+        "default",
+        "choices",
+        "validate",
+        "prompt_with_default",
+        "prompt_when_missing",
+    )
+
     def __init__(
         self,
         *,
@@ -39,7 +70,7 @@ class PromptMeta:
         message: str,
         default: str | int | Callable[..., Any] | None = None,
         choices: Callable[[click.Context], Sequence[Any]] | Sequence[Any] | None = None,
-        validate: Validator | None = None,
+        validate: "Validator | Callable[[str], bool] | LazyValidator | None" = None,
         # Whether to prompt the user even if a default is provided, but no cli argument is given
         prompt_with_default: bool = False,
         # Whether to prompt the user when both the default and the CLI arg are missing
@@ -71,11 +102,20 @@ class InquirerOption(click.Option):
         ):
             kwargs.setdefault("prompt", True)
         super().__init__(*args, **kwargs)
+        # Options always have a name, narrowed once here rather than on every lookup
+        self._param_name: str = cast(str, self.name)
+
+        # Prompt kwargs that don't depend on the click context, built once per option
+        self._base_prompt_kwargs: dict[str, Any] = {"message": self.prompt_meta.message}
+        if self.prompt_meta.prompt_type == "fuzzy":
+            self._base_prompt_kwargs["info"] = False
+        # Resolved on the first prompt, which keeps InquirerPy off the import path
+        self._prompt_fn: Callable[..., Any] | None = None
 
     @override
     def prompt_for_value(self, ctx: click.Context) -> Any:
-        param_name: str = cast(str, self.name)
-        existing = ctx.params.get(param_name)
+        prompt_meta = self.prompt_meta
+        existing = ctx.params.get(self._param_name)
 
         # 1) CLI override always wins
         if existing is not None:
@@ -83,15 +123,25 @@ class InquirerOption(click.Option):
 
         # 2) if a default is set and we’re not prompting with default, return it;
         # otherwise (no default or prompt_with_default=True) continue to prompt
-        if self.prompt_meta.default is not None and not self.prompt_meta.prompt_with_default:
-            return self.prompt_meta.default
-
-        # 3) Alternate Syntax: call the inquirer prompt class directly
-        prompt_fn = getattr(inquirer, self.prompt_meta.prompt_type)
-        prompt_kwargs: dict[str, Any] = {"message": self.prompt_meta.message}
-
-        if self.prompt_meta.prompt_type == "fuzzy":
-            prompt_kwargs["info"] = False
+        if prompt_meta.default is not None and not prompt_meta.prompt_with_default:
+            return prompt_meta.default
+
+        return self._do_prompt(ctx)
+
+    def _do_prompt(self, ctx: click.Context) -> Any:
+        """Prompt with InquirerPy until the answer converts to a valid value."""
+        # Alternate Syntax: call the inquirer prompt class directly
+        prompt_fn = self._prompt_fn
+        if prompt_fn is None:
+            from .prompts import inquirer
+
+            prompt_fn = self._prompt_fn = getattr(inquirer, self.prompt_meta.prompt_type)
+            validate = self.prompt_meta.validate
+            if validate:
+                self._base_prompt_kwargs["validate"] = (
+                    validate.factory() if isinstance(validate, LazyValidator) else validate
+                )
+        prompt_kwargs = dict(self._base_prompt_kwargs)
 
         # Derive default: static or ctx-aware callable
         default = self.prompt_meta.default
@@ -116,9 +166,6 @@ class InquirerOption(click.Option):
         if choices is not None:
             prompt_kwargs["choices"] = choices
 
-        if self.prompt_meta.validate:
-            prompt_kwargs["validate"] = self.prompt_meta.validate
-
         # Looping until a valid answer is provided - accomodates custom validators
         while True:
             answer = prompt_fn(**prompt_kwargs).execute()
@@ -135,7 +182,7 @@ class AppNameParamType(click.ParamType):
     @override
     def convert(self, value, param, ctx):
         v = value.strip().lower()
-        if not re.fullmatch(r"[a-z0-9_-]+", v):
+        if not _APP_NAME_RE.fullmatch(v):
             self.fail(
                 "Only letters, numbers, dash and underscore are allowed.",
                 param,
@@ -157,7 +204,7 @@ def fancy_option(
     message: str,
     default: Any = None,
     choices: Callable[[click.Context], Sequence[Any]] | None = None,
-    validate: Validator | None = None,
+    validate: "Validator | Callable[[str], bool] | LazyValidator | None" = None,
     prompt_with_default: bool = False,
     prompt_when_missing: bool = True,
     **kwargs,
@@ -173,7 +220,7 @@ def fancy_option(
     :param choices: A callable that returns a sequence of choices. Note: if :class:`click.Choice`
                     is used as the type, choices will be derived from it instead.
     :param validate: Validator, optional
-        A validation function or object to validate user input.
+        A validation function or object to validate user input, or a :class:`LazyValidator`.
     :param prompt_with_default: Whether to show the default value in the prompt. Defaults to False.
     :param prompt_when_missing: Whether to prompt only when the option is missing. Defaults to True.
     **kwargs: Additional keyword arguments forwarded to Click.
@@ -189,14 +236,14 @@ def fancy_option(
             prompt_with_default=prompt_with_default,
             prompt_when_missing=prompt_when_missing,
         )
-        wrapped = click.option(
+        # click.option registers the parameter on `f` and returns `f` itself, nothing to wrap
+        return click.option(
             *param_decls,
             cls=InquirerOption,
             prompt_meta=meta,
             default=default,
             **kwargs,
         )(f)
-        return cast(F, functools.wraps(f)(wrapped))
 
     return decorator
 
@@ -210,21 +257,62 @@ def get_param(ctx: click.Context, name: str, default=None):
     return value
 
 
-def get_ns_choices(ctx: click.Context) -> list[str]:
-    """Get a list of namespaces from the k8s_app_dir, robustly and idiomatically."""
+# Per (resolved k8s_app_dir, its mtime_ns): the sorted namespace names shown in the prompt,
+# plus a set of the same names for membership checks
+_ns_cache: dict[tuple[Path, int], tuple[list[str], frozenset[str]]] = {}
+
+
+def _load_namespaces(ctx: click.Context) -> tuple[list[str], frozenset[str]]:
+    """Namespaces in the k8s_app_dir, cached until the directory changes."""
+    from .fluxit import get_ns
+
     k8s_app_dir = ctx.params.get("k8s_app_dir")
     if not k8s_app_dir:
         raise click.UsageError("--k8s-app-dir must be set before selecting a namespace.")
+    try:
+        cache_key = (Path(k8s_app_dir).resolve(), os.stat(k8s_app_dir).st_mtime_ns)
+    except OSError:
+        # Let get_ns report the invalid path
+        cache_key = None
+    if cache_key and (cached := _ns_cache.get(cache_key)) is not None:
+        return cached
     try:
         ns_dict = get_ns(k8s_app_dir)
         choices = sorted(ns_dict.keys())
         if not choices:
             raise click.UsageError(f"No namespaces found in {k8s_app_dir}.")
-        return choices
+        cached = (choices, frozenset(choices))
+        if cache_key:
+            _ns_cache[cache_key] = cached
+        return cached
     except Exception as e:
         raise click.UsageError(f"Error fetching namespaces: {e}")
 
 
+def get_ns_choices(ctx: click.Context) -> list[str]:
+    """Get a list of namespaces from the k8s_app_dir, robustly and idiomatically."""
+    return _load_namespaces(ctx)[0]
+
+
+def is_valid_ns(ctx: click.Context, name: str) -> bool:
+    """Whether `name` is one of the namespaces found in the k8s_app_dir."""
+    return name in _load_namespaces(ctx)[1]
+
+
+def param_existing_dir_callback(ctx: click.Context, param: click.Parameter, value: Path) -> Path:
+    """Click callback requiring the value to be an existing directory, checked with a single stat.
+
+    :return: `Path` the unchanged value.
+    """
+    try:
+        st_mode = os.stat(value).st_mode
+    except OSError:
+        raise click.BadParameter(f"Directory {str(value)!r} does not exist.")
+    if not stat.S_ISDIR(st_mode):
+        raise click.BadParameter(f"Directory {str(value)!r} is a file.")
+    return value
+
+
 def param_ingress_host_callback(ctx: click.Context, param: click.ParamType, value: str) -> str:
     """Click callback to require a value if option ingress != 'disabled'.
     It also sets the default value for the InquirerPy prompt based on the app_name option.
@@ -236,6 +324,9 @@ def param_ingress_host_callback(ctx: click.Context, param: click.ParamType, valu
         return value
     app_name = ctx.params.get("app_name", "")
     default_host = app_name.replace("_", "-")
+
+    from .prompts import inquirer
+
     value = inquirer.text(
         message="App Ingress Hostname:",
         default=default_host,  # Always pass the computed default
@@ -247,11 +338,11 @@ def param_ingress_host_callback(ctx: click.Context, param: click.ParamType, valu
     return value
 
 
-class IngressHostValidator(Validator):
-    @override
-    def validate(self, document) -> None:
-        value: str = document.text
-        if not re.fullmatch(r"[a-z0-9-]+", value):
-            raise ValidationError(
-                message="Ingress host must only contain lowercase letters, numbers, and dashes."
-            )
+def _make_ingress_host_validator() -> "Validator":
+    """Validator factory for the ingress host prompt, resolved only when prompting."""
+    from .prompts import IngressHostValidator
+
+    return IngressHostValidator()
+
+
+ingress_host_validator = LazyValidator(_make_ingress_host_validator)
@@ -4,18 +4,65 @@ using Jinja templates.
 """
 
 import difflib
+import functools
 import logging
+import os
 import pathlib
-from io import StringIO
+import threading
+from collections.abc import Iterator
+from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING, override
 
 import jinja2 as j2
-from ruamel.yaml import YAML, YAMLObject
 
 from ._defaults import defaults
 
+if TYPE_CHECKING:
+    from ruamel.yaml import YAML, YAMLObject
+
 logger = logging.getLogger(__name__)
 
+# ruamel.yaml instances keep parser and emitter state, so each thread gets its own.
+# ruamel.yaml itself is only imported once YAML is needed, e.g. runs where every rendered
+# file matches what is already on disk never load it.
+_yaml_local = threading.local()
+
+
+def _safe_yaml() -> "YAML":
+    """
+    Reusable safe YAML loader for plain data, libyaml-backed when available.
+
+    Returns:
+        YAML: The calling thread's safe loader instance.
+    """
+    try:
+        return _yaml_local.safe
+    except AttributeError:
+        from ruamel.yaml import YAML
+
+        _yaml_local.safe = YAML(typ="safe", pure=False)
+        return _yaml_local.safe
+
+
+def _roundtrip_yaml() -> "YAML":
+    """
+    Reusable round-trip YAML instance, preserving comments, anchors and quotes.
+
+    Returns:
+        YAML: The calling thread's round-trip instance.
+    """
+    try:
+        return _yaml_local.roundtrip
+    except AttributeError:
+        from ruamel.yaml import YAML
+
+        yaml = YAML()
+        yaml.preserve_quotes = True
+        yaml.indent(mapping=2, sequence=4, offset=2)
+        _yaml_local.roundtrip = yaml
+        return yaml
+
 
 def init_logging(log_level: str = "INFO") -> logging.Logger:
     """
@@ -38,10 +85,13 @@ def init_logging(log_level: str = "INFO") -> logging.Logger:
     return logger
 
 
-def get_ns(path: str) -> dict[str, YAMLObject]:
+def get_ns(path: str) -> dict[str, "YAMLObject"]:
     """
     Discover and parse namespaces from a directory.
 
+    Results are memoized per `path` and directory mtime, so they are reused until
+    namespace directories are added, removed or renamed.
+
     Args:
         path (str): Path to the directory containing namespace subdirectories.
 
@@ -49,29 +99,47 @@ def get_ns(path: str) -> dict[str, YAMLObject]:
         dict[str, YAMLObject]: Dictionary mapping namespace names to their parsed data:
         {ns_name: parsed_data}
     """
-    if pathlib.Path(path).is_dir():
-        namespaces = {}
-        for item in pathlib.Path(path).iterdir():
-            if item.is_dir() and (item / defaults.ns_kustomize_file).exists():
-                ns_ks_file: Path = item.joinpath(defaults.ns_kustomize_file)
-                ns_data = parse_namespace(file=ns_ks_file)
-                if ns_data:
-                    ns_name = ns_data.get("namespace")
-                else:
-                    logger.warning(f"Parsing {ns_ks_file} did not return anything")
-                    continue
-                if ns_name:
-                    namespaces[ns_name] = ns_data
-                    logger.debug(f"Found namespace: {ns_name} in {ns_ks_file}")
-                else:
-                    logger.warning(f"No namespace found in {ns_ks_file}")
-        return namespaces
-    else:
-        logger.error(f"Invalid path: {path}")
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        logger.error("Invalid path: %s", path)
         return {}
+    return _get_ns_cached(str(path), mtime_ns)
 
 
-def parse_namespace(file: pathlib.Path) -> YAMLObject | None:
+@functools.lru_cache(maxsize=32)
+def _get_ns_cached(path: str, mtime_ns: int) -> dict[str, "YAMLObject"]:
+    """Namespace discovery behind :func:`get_ns`, `mtime_ns` is only part of the cache key."""
+    # DirEntry caches the file type from the directory read, saving a stat per entry
+    ns_ks_files: list[Path] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    ns_ks_file = os.path.join(entry.path, defaults.ns_kustomize_file)
+                    if os.path.exists(ns_ks_file):
+                        ns_ks_files.append(Path(ns_ks_file))
+    except OSError:
+        logger.error("Invalid path: %s", path)
+        return {}
+
+    namespaces = {}
+    for ns_ks_file in ns_ks_files:
+        ns_data = parse_namespace(ns_ks_file)
+        if ns_data:
+            ns_name = ns_data.get("namespace")
+        else:
+            logger.warning("Parsing %s did not return anything", ns_ks_file)
+            continue
+        if ns_name:
+            namespaces[ns_name] = ns_data
+            logger.debug("Found namespace: %s in %s", ns_name, ns_ks_file)
+        else:
+            logger.warning("No namespace found in %s", ns_ks_file)
+    return namespaces
+
+
+def parse_namespace(file: pathlib.Path) -> "YAMLObject | None":
     """
     Parse a namespace YAML file.
 
@@ -81,127 +149,283 @@ def parse_namespace(file: pathlib.Path) -> YAMLObject | None:
     Returns:
         YAMLObject | None: Parsed YAML data as a dictionary, or None if parsing fails.
     """
-    yaml = YAML(typ="safe")
     try:
         with open(file, "r") as f:
-            data = yaml.load(f)
+            data = _safe_yaml().load(f)
         return data
     except Exception as e:
-        logger.error(f"Failed to parse file {file}: {e}")
+        logger.error("Failed to parse file %s: %s", file, e)
         return None
 
 
-def render_templates(templates_path: str, context: dict) -> dict[str, str]:
+def _bytecode_cache_dir() -> str | None:
     """
-    Recursively render Jinja templates in the provided path using the context dictionary.
+    Location of the persistent Jinja bytecode cache, following the XDG base directory spec.
+
+    The location can be overridden with `FLUXIT_CACHE_DIR`, setting it to an empty
+    value disables the cache.
+
+    Returns:
+        str | None: `$XDG_CACHE_HOME/fluxit/jinja`, defaulting to `~/.cache/fluxit/jinja`,
+        or None when the cache is disabled.
+    """
+    if (cache_dir := os.environ.get("FLUXIT_CACHE_DIR")) is not None:
+        return cache_dir or None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "fluxit", "jinja")
+
+
+class _BestEffortBytecodeCache(j2.FileSystemBytecodeCache):
+    """
+    A :class:`j2.FileSystemBytecodeCache` that never fails a render.
+
+    An unreadable, unwritable or corrupt cache entry only means the template is compiled
+    from source, e.g. when the cache directory is left owned by root after a `sudo fluxit`.
+    """
+
+    @override
+    def load_bytecode(self, bucket: j2.bccache.Bucket) -> None:
+        try:
+            super().load_bytecode(bucket)
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            logger.debug("Ignoring unusable Jinja bytecode cache entry: %s", e)
+            bucket.reset()
+
+    @override
+    def dump_bytecode(self, bucket: j2.bccache.Bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            logger.debug("Could not write Jinja bytecode cache entry: %s", e)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_env(templates_path: str) -> j2.Environment:
+    """
+    Build (once per templates path) the Jinja environment used for rendering.
+
+    Compiled templates are kept in the environment's in-memory cache, and persisted
+    to a bytecode cache on disk so that later runs skip lexing and parsing.
 
     Args:
         templates_path (str): The path to the directory containing templates.
-        context (dict): A dictionary containing context variables for rendering.
 
     Returns:
-        dict[str, str]: A dictionary containing `{path: content}` of rendered Jinja templates.
+        j2.Environment: The memoized environment for `templates_path`.
+    """
+    bytecode_cache = None
+    if (cache_dir := _bytecode_cache_dir()) is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            bytecode_cache = _BestEffortBytecodeCache(directory=cache_dir)
+        except OSError as e:
+            logger.debug("Jinja bytecode cache disabled, cannot use %s: %s", cache_dir, e)
+
+    return j2.Environment(
+        loader=j2.FileSystemLoader(templates_path),
+        undefined=j2.StrictUndefined,
+        auto_reload=False,
+        # Never evict compiled templates, each one is rendered at least once per run
+        cache_size=-1,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def clear_template_caches() -> None:
     """
-    env = j2.Environment(loader=j2.FileSystemLoader(templates_path), undefined=j2.StrictUndefined)
-    rendered_templates = {}
+    Drop the memoized Jinja environments and template lists along with their compiled templates.
+    The on-disk bytecode cache is left intact, since it is validated against the template source.
+    """
+    load_templates.cache_clear()
+    _get_env.cache_clear()
+
+
+@functools.lru_cache(maxsize=8)
+def load_templates(templates_path: str) -> tuple[tuple[Path, j2.Template], ...]:
+    """
+    Find and compile (once per templates path) every Jinja template in the provided path.
+
+    Args:
+        templates_path (str): The path to the directory containing templates.
 
-    for path in pathlib.Path(templates_path).rglob("*.j2"):
-        if path.is_file():
-            relative_path = None
+    Returns:
+        tuple[tuple[Path, j2.Template], ...]: `(path, template)` pairs grouped by directory,
+        where `path` is relative to `templates_path` with the `.j2` extension stripped.
+    """
+    env = _get_env(templates_path)
+    templates = []
+
+    # A single os.walk pass, without building a Path object for every directory entry
+    for root, dirs, files in os.walk(templates_path):
+        # Walk in name order, so the output order does not depend on the filesystem
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".j2"):
+                continue
+            path = os.path.join(root, name)
+            relative_path = os.path.relpath(path, templates_path)
             try:
-                relative_path = str(path.relative_to(templates_path))
-                template = env.get_template(relative_path)
-                rendered_content = template.render(context)
-                # Skip files containing only the special keyword: '__SKIP__'
-                if rendered_content.strip() == "__SKIP__":
-                    continue
-                rendered_templates[relative_path] = rendered_content
-            except j2.UndefinedError as e:
-                logger.error(f"{relative_path} -> No value provided for template var: {e}.")
-                exit(1)
+                template = env.get_template(relative_path.replace(os.sep, "/"))
+            # The loader only serves regular files, anything else (e.g. a dangling symlink)
+            # is skipped, as the previous is_file() filter did
+            except j2.TemplateNotFound:
+                logger.debug("Skipping %s, not a regular file", path)
+                continue
             except Exception as e:
-                logger.error(f"Failed to render template {path}: {e}")
+                logger.error("Failed to render template %s: %s", path, e)
                 exit(1)
-    return rendered_templates
+            # Preserve subdirectory structure and strip only the .j2 extension
+            templates.append((Path(relative_path).with_suffix(""), template))
+    return tuple(templates)
 
 
-# TODO: fix the return types of this function, it's super confusing
-def validate_and_format_yaml(content: str) -> tuple[list[object] | None, str]:
+def iter_rendered_templates(templates_path: str, context: dict) -> Iterator[tuple[Path, bytes]]:
     """
-    Validate and format YAML content.
+    Recursively render Jinja templates in the provided path using the context dictionary.
+
+    Templates are rendered lazily, one per iteration, so callers can save each file
+    before the next one is rendered instead of holding the whole scaffold in memory.
+
+    Args:
+        templates_path (str): The path to the directory containing templates.
+        context (dict): A dictionary containing context variables for rendering.
+
+    Yields:
+        tuple[Path, bytes]: `(path, content)` pairs of rendered Jinja templates, in the order of
+        :func:`load_templates`. Content is UTF-8 encoded, ready to be compared with or written
+        to files.
+    """
+    for output_path, template in load_templates(templates_path):
+        try:
+            rendered_content = template.render(context)
+        except j2.UndefinedError as e:
+            logger.error("%s -> No value provided for template var: %s.", template.name, e)
+            exit(1)
+        except Exception as e:
+            logger.error("Failed to render template %s: %s", template.filename, e)
+            exit(1)
+        # Skip files containing only the special keyword: '__SKIP__'.
+        # The substring check spares regular templates from copying their content to strip it.
+        if "__SKIP__" in rendered_content and rendered_content.strip() == "__SKIP__":
+            continue
+        yield output_path, rendered_content.encode("utf-8")
+
+
+def render_templates(templates_path: str, context: dict) -> list[tuple[Path, bytes]]:
+    """
+    Render every template up front, see :func:`iter_rendered_templates`.
+
+    Returns:
+        list[tuple[Path, bytes]]: The rendered `(path, content)` pairs, sorted by `path`.
+    """
+    return sorted(iter_rendered_templates(templates_path, context))
+
+
+def format_yaml(content: str) -> bytes | None:
+    """
+    Validate and format YAML content, straight to the UTF-8 bytes that get written.
 
     Tries to parse the input string as YAML (potentially multi-document).
-    If successful, returns the parsed data and a consistently formatted YAML string.
-    If parsing fails, returns None and the original content.
+    Validation failures are reported through the return value rather than raised.
 
     Args:
         content (str): The string content to validate and format.
 
     Returns:
-        tuple[list[object] | None, str]: List of rendered YAML documents, rendered content when
-        parsing resulted in changes, and original content when no change. #fixme
-
+        bytes | None: The formatted content, UTF-8 encoded, when the content is valid YAML
+        with at least one non-empty document, otherwise None.
     """
-    yaml = YAML()
-    yaml.preserve_quotes = True
-    yaml.indent(mapping=2, sequence=4, offset=2)
+    # Templates rendering only blank lines, comments and document markers can't hold any data
+    if all(
+        not line or line.startswith("#") or line in ("---", "...")
+        for line in map(str.strip, content.splitlines())
+    ):
+        logger.debug("YAML content only contains comments or empty documents.")
+        return None
+
+    from ruamel.yaml import YAMLError
+
+    yaml = _roundtrip_yaml()
     try:
         # Use load_all to handle multi-document YAML files
         parsed_data = list(yaml.load_all(content))
-        with StringIO() as string_stream:
-            yaml.dump_all(parsed_data, string_stream)
-            formatted_content = string_stream.getvalue()
         # Check if any actual data was parsed (ignore empty documents like '---')
+        # This handles cases like templates rendering only comments or whitespace
         if not any(doc for doc in parsed_data if doc is not None):
             logger.debug("YAML content resulted in empty documents after parsing.")
-            # Return original content if parsing resulted in nothing meaningful
-            # This handles cases like templates rendering only comments or whitespace
-            return None, content
-        return parsed_data, formatted_content
-    except Exception as e:
-        logger.warning(f"Could not parse content as YAML, proceeding with raw content. Error: {e}")
-        return None, content
+            return None
+        # ruamel encodes into binary streams itself, no intermediate str
+        with BytesIO() as byte_stream:
+            yaml.dump_all(parsed_data, byte_stream)
+            return byte_stream.getvalue()
+    # ruamel's constructors raise plain ValueError for bad scalars (e.g. `!!int foo`)
+    except (YAMLError, ValueError) as e:
+        logger.warning("Could not parse content as YAML. Error: %s", e)
+        return None
 
 
-def write_template(output_path: pathlib.Path, content: str) -> None:
+def write_template(output_path: pathlib.Path, content: str | bytes) -> None:
     """
     Write content to the specified file path.
 
+    The content is written to a temporary file next to the target, which then replaces it,
+    so an interrupted run never leaves a partially written manifest behind.
+
     Args:
         output_path (pathlib.Path): The full path to the output file.
-        content (str): The content to write to the file.
+        content (str | bytes): The content to write to the file, bytes must be UTF-8 encoded.
     """
+    # Write through symlinks to their target rather than replacing the link itself
+    target = os.path.realpath(output_path)
+    tmp_path = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.fluxit-tmp")
     try:
-        with open(output_path, "w") as f:
-            f.write(content)
+        # Keep the permissions of a file being overwritten, new files get the usual 0o666 & ~umask
+        try:
+            mode = os.stat(target).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = None
+        # Encoded in one go, skipping the incremental encoder of a text-mode file
+        data = memoryview(content.encode("utf-8") if isinstance(content, str) else content)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            if mode is not None:
+                os.fchmod(fd, mode)
+            while data:
+                data = data[os.write(fd, data) :]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, target)
     except IOError as e:
-        logger.error(f"Failed to write file {output_path}: {e}")
+        logger.error("Failed to write file %s: %s", output_path, e)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
 
 
-def read_file_content(file_path: pathlib.Path) -> str | None:
+def read_file_bytes(file_path: pathlib.Path) -> tuple[bool, bytes | None]:
     """
-    Safely reads the content of a file.
+    Safely reads the raw content of a file, with a single read and no separate existence check.
 
     Args:
         file_path (pathlib.Path): The path to the file.
 
     Returns:
-        str | None: The file content as a string, or None if the file doesn't exist
-        or cannot be read.
+        tuple[bool, bytes | None]: `(exists, content)`, `(False, None)` when the file doesn't
+        exist, or `(True, None)` when it exists but cannot be read.
     """
-    if not file_path.exists():
-        return None
     try:
-        with open(file_path, "r") as f:
-            return f.read()
+        return True, file_path.read_bytes()
+    except FileNotFoundError:
+        return False, None
     except IOError as e:
-        logger.warning(f"Could not read file {file_path}: {e}")
-        return None
+        logger.warning("Could not read file %s: %s", file_path, e)
+        return True, None
 
 
-def generate_diff(old_content: str, new_content: str, file_name: str) -> str:
+def generate_diff_lines(old_content: str, new_content: str, file_name: str) -> list[str]:
     """
-    Generates a unified diff string between old and new content.
+    Generates the lines of a unified diff between old and new content.
 
     Args:
         old_content (str): The original content (e.g., existing file).
@@ -209,12 +433,15 @@ def generate_diff(old_content: str, new_content: str, file_name: str) -> str:
         file_name (str): The name to use for the file in the diff header.
 
     Returns:
-        str: A string containing the unified diff.
+        list[str]: The unified diff lines, newlines included, empty when the contents are identical.
     """
-    diff_lines = difflib.unified_diff(
-        old_content.splitlines(keepends=True),
-        new_content.splitlines(keepends=True),
-        fromfile=f"a/{file_name}",
-        tofile=f"b/{file_name}",
+    if old_content == new_content:
+        return []
+    return list(
+        difflib.unified_diff(
+            old_content.splitlines(keepends=True),
+            new_content.splitlines(keepends=True),
+            fromfile=f"a/{file_name}",
+            tofile=f"b/{file_name}",
+        )
     )
-    return "".join(diff_lines)
@@ -1,55 +1,95 @@
 # fluxit/output.py
 import logging
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
-from InquirerPy import inquirer
-
 from . import fluxit
 
 
-def colorize_diff(diff: str, use_color: bool = True) -> str:
+def ensure_parent_dir(file_path: Path, created_dirs: set[Path] | None = None) -> None:
+    """Creates the parent directory of `file_path`.
+
+    Args:
+        file_path: The file whose parent directory should exist.
+        created_dirs: Directories already created during the current run, updated in place,
+            so repeated parents are only created once. Without it, the directory is always created.
+    """
+    parent = file_path.parent
+    if created_dirs is None or parent not in created_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        if created_dirs is not None:
+            created_dirs.add(parent)
+
+
+# ANSI color per diff line marker, the first character of each line
+_DIFF_COLORS = {
+    "+": "\033[32m",  # green
+    "-": "\033[31m",  # red
+    "@": "\033[36m",  # cyan
+}
+_RESET = "\033[0m"
+
+
+def colorize_diff(diff: str | list[str], use_color: bool = True) -> str:
+    # Accepts the diff lines as produced by fluxit.generate_diff_lines, saving a re-split
     if not use_color:
-        return diff
-    RED = "\033[31m"
-    GREEN = "\033[32m"
-    CYAN = "\033[36m"
-    RESET = "\033[0m"
+        return diff if isinstance(diff, str) else "".join(diff)
+    lines = diff.splitlines(keepends=True) if isinstance(diff, str) else diff
     result = []
-    for line in diff.splitlines(keepends=True):
-        if line.startswith("+") and not line.startswith("+++"):
-            result.append(f"{GREEN}{line}{RESET}")
-        elif line.startswith("-") and not line.startswith("---"):
-            result.append(f"{RED}{line}{RESET}")
-        elif line.startswith("@"):
-            result.append(f"{CYAN}{line}{RESET}")
-        else:
-            result.append(line)
+    # The ---/+++ file headers only come before the first hunk, so after that
+    # every line is classified by its first character alone
+    in_header = True
+    for line in lines:
+        if in_header:
+            if line.startswith(("---", "+++")):
+                result.append(line)
+                continue
+            in_header = False
+        color = _DIFF_COLORS.get(line[:1])
+        result.append(f"{color}{line}{_RESET}" if color else line)
     return "".join(result)
 
 
 def confirm_and_save(
     output_file_path: Path,
-    formatted_content: str,
+    raw_content: bytes,
+    formatter: Callable[[], bytes | None],
     confirm: str,
     logger: logging.Logger,
     color: bool = True,
+    created_dirs: set[Path] | None = None,
 ) -> None:
-    """Handles the confirmation and saving logic for a single file.
+    """Handles the validation, confirmation and saving logic for a single file.
 
     Args:
         output_file_path: The path where the file should be saved.
-        formatted_content: The validated and formatted content to save.
+        raw_content: The rendered, not yet formatted content, UTF-8 encoded.
+        formatter: Returns the formatted content for `raw_content`, UTF-8 encoded, or None
+            when it is not valid YAML. Only called when the formatted content is actually needed.
         confirm: Confirmation mode ('always', 'never', 'if_exists').
         logger: The logger instance.
         color: Whether to use color for diff output.
+        created_dirs: Directories already created during the current run,
+            see :func:`ensure_parent_dir`.
     """
     proceed_to_save = True
-    file_exists = output_file_path.exists()
-    existing_content = fluxit.read_file_content(output_file_path) if file_exists else None
+    # Compared as bytes, the existing content is only decoded if a diff has to be shown
+    file_exists, existing_bytes = fluxit.read_file_bytes(output_file_path)
+
+    # Re-runs with unchanged output don't need any YAML work
+    if existing_bytes is not None and existing_bytes == raw_content:
+        logger.info("Skipped (no changes): %s", output_file_path)
+        return
 
-    if file_exists and existing_content == formatted_content:
-        logger.info(f"Skipped (no changes): {output_file_path}")
+    formatted_content = formatter()
+    if formatted_content is None:
+        logger.warning("Skipping invalid YAML file: %s", output_file_path)
+        return
+
+    # Skips the diff and the prompt entirely when nothing changed
+    if existing_bytes is not None and existing_bytes == formatted_content:
+        logger.info("Skipped (no changes): %s", output_file_path)
         return
 
     needs_confirmation = confirm == "always" or (confirm == "if_exists" and file_exists)
@@ -58,21 +98,20 @@ def confirm_and_save(
         print("-" * 20)
         print(f"Processing file: {output_file_path}")
 
-        if file_exists and existing_content:
-            diff = fluxit.generate_diff(
-                existing_content,
-                formatted_content,
+        if file_exists and existing_bytes:
+            diff = fluxit.generate_diff_lines(
+                existing_bytes.decode("utf-8"),
+                formatted_content.decode("utf-8"),
                 output_file_path.name,
             )
 
             print("Proposed changes (diff):")
-            # Print diff directly as it's already a string
             print(colorize_diff(diff, use_color=color), end="")
             print("-" * 20)
         else:
             # Show full content if it's a new file or reading failed
             print("Rendered content:")
-            print(formatted_content)
+            print(formatted_content.decode("utf-8"))
             print("-" * 20)
 
         if file_exists:
@@ -80,6 +119,8 @@ def confirm_and_save(
         else:
             message = f"Save file {output_file_path}?"
 
+        from .prompts import inquirer
+
         try:
             proceed_to_save = inquirer.confirm(
                 message=message,
@@ -89,7 +130,7 @@ def confirm_and_save(
             ).execute()
 
             if not proceed_to_save:
-                logger.warning(f"Skipped: {output_file_path}")
+                logger.warning("Skipped: %s", output_file_path)
                 return
 
         # Handle ctrl+C gracefully
@@ -98,13 +139,13 @@ def confirm_and_save(
             sys.exit(0)
     # When --confirm=never, it's #YOLO mode
     elif confirm == "never" and file_exists:
-        logger.warning(f"Overwriting existing file due to --confirm=never: {output_file_path}")
+        logger.warning("Overwriting existing file due to --confirm=never: %s", output_file_path)
         proceed_to_save = True
 
     if proceed_to_save:
         try:
-            output_file_path.parent.mkdir(parents=True, exist_ok=True)
+            ensure_parent_dir(output_file_path, created_dirs)
             fluxit.write_template(output_file_path, formatted_content)
-            logger.info(f"Saved: {output_file_path}")
+            logger.info("Saved: %s", output_file_path)
         except Exception as e:
-            logger.error(f"Error saving {output_file_path}: {e}")
+            logger.error("Error saving %s: %s", output_file_path, e)
@@ -0,0 +1,26 @@
+"""
+prompts.py: InquirerPy-backed prompt runtime.
+
+This module is only imported once a prompt actually fires, so `--help`, `--version`
+and argument errors never pay for loading InquirerPy and prompt_toolkit.
+"""
+
+import re
+from typing import override
+
+from InquirerPy import inquirer
+from InquirerPy.validator import ValidationError, Validator
+
+__all__ = ["IngressHostValidator", "inquirer"]
+
+_INGRESS_HOST_RE = re.compile(r"[a-z0-9-]+")
+
+
+class IngressHostValidator(Validator):
+    @override
+    def validate(self, document) -> None:
+        value: str = document.text
+        if not _INGRESS_HOST_RE.fullmatch(value):
+            raise ValidationError(
+                message="Ingress host must only contain lowercase letters, numbers, and dashes."
+            )